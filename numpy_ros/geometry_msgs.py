@@ -4,7 +4,7 @@
 
 # TODO documentation
 
-import collections
+import operator
 import warnings
 
 import numpy as np
@@ -15,9 +15,7 @@ with warnings.catch_warnings():
     warnings.simplefilter('ignore')
     import quaternion
 
-from numpy_ros.conversions import (
-    converts_to_numpy, converts_to_message, to_message
-)
+from numpy_ros.conversions import converts_to_numpy, converts_to_message
 
 try:
     from geometry_msgs.msg import (
@@ -42,7 +40,7 @@ _stamped_type_to_attr = {
     PointStamped: 'point',
     PolygonStamped: 'polygon',
     PoseStamped: 'pose',
-    PoseWithCovariance: 'pose',
+    PoseWithCovarianceStamped: 'pose',
     QuaternionStamped: 'quaternion',
     TransformStamped: 'transform',
     TwistStamped: 'twist',
@@ -51,6 +49,45 @@ _stamped_type_to_attr = {
     WrenchStamped: 'wrench',
 }
 
+# Fetch several message fields in a single C-level call
+_get_xyz = operator.attrgetter('x', 'y', 'z')
+_get_xyzw = operator.attrgetter('x', 'y', 'z', 'w')
+
+# Field names by message type (for numpy_to_*), and field getters derived
+# from them (for *_to_numpy)
+_kinematics_type_to_keys = {
+    Accel: ('linear', 'angular'),
+    Twist: ('linear', 'angular'),
+    Wrench: ('force', 'torque'),
+}
+
+# Also holds the message type of the position/translation field
+_frame_type_to_keys = {
+    Pose: ('position', 'orientation', Point),
+    Transform: ('translation', 'rotation', Vector3),
+}
+
+# Also holds the message type of the kinematics field
+_covariance_type_to_keys = {
+    AccelWithCovariance: ('accel', Accel),
+    TwistWithCovariance: ('twist', Twist),
+}
+
+_kinematics_type_to_fields = {
+    message_type: operator.attrgetter(*keys)
+    for message_type, keys in _kinematics_type_to_keys.items()
+}
+
+_frame_type_to_fields = {
+    message_type: operator.attrgetter(*keys[:2])
+    for message_type, keys in _frame_type_to_keys.items()
+}
+
+_covariance_type_to_fields = {
+    message_type: operator.attrgetter(keys[0])
+    for message_type, keys in _covariance_type_to_keys.items()
+}
+
 
 def _unstamp(message):
     """Unstamps a given message."""
@@ -66,12 +103,12 @@ def cast_to_dtype(array, dtype):
     """Raises a TypeError if `array` cannot be casted to `dtype` without
     loss of precision."""
 
-    min_dtype = np.min_scalar_type(array)
+    array = np.asarray(array)
 
-    if not np.can_cast(min_dtype, dtype):
+    if not np.can_cast(array.dtype, dtype):
         raise TypeError(f'Cannot safely cast array {array} to dtype {dtype}.')
 
-    return array.astype(dtype)
+    return array.astype(dtype, copy=False)
 
 
 def _assert_has_shape(array, *shapes):
@@ -90,50 +127,74 @@ def vector_to_numpy(message, homogeneous=False):
 
     message = _unstamp(message)
 
-    data = [message.x, message.y, message.z]
+    dtype = np.float32 if isinstance(message, Point32) else np.float64
+    array = np.empty(4 if homogeneous else 3, dtype=dtype)
 
-    if homogeneous:
-        data.append(1.0)
+    # Scalar stores avoid converting the tuple into a temporary array
+    x, y, z = _get_xyz(message)
 
-    dtype = np.float32 if isinstance(message, Point32) else np.float64
-    array = np.array(data, dtype=dtype)
+    array[0] = x
+    array[1] = y
+    array[2] = z
+
+    if homogeneous:
+        array[3] = 1.0
 
     return array
 
 
-@converts_to_message(Vector3, Point, Point32)
-def numpy_to_vector(message_type, array):
+def _as_vector(array, dtype):
+    """Casts `array` to `dtype`, raising if it is not a 3-vector or a
+    homogeneous 4-vector."""
 
-    dtype = np.float32 if message_type is Point32 else np.float64
     array = cast_to_dtype(array, dtype)
 
     _assert_has_shape(array, (3,), (4,))
 
-    if len(array) == 4 and not np.isclose(array[3], 1.0):
+    # Same tolerance as np.isclose(array[3], 1.0), minus the ufunc overhead
+    if len(array) == 4 and not abs(float(array[3]) - 1.0) <= 1e-8 + 1e-5:
         raise ValueError(
             (f'Input array has four components, but last component is '
              f'{array[3]:.2} != 1.')
         )
 
-    return message_type(*array[:3])
+    return array
+
+
+def _vector_to_message(message_type, array):
+    """Constructs a vector message from an already validated array."""
+    return message_type(float(array[0]), float(array[1]), float(array[2]))
+
+
+@converts_to_message(Vector3, Point, Point32)
+def numpy_to_vector(message_type, array):
+
+    dtype = np.float32 if message_type is Point32 else np.float64
+    return _vector_to_message(message_type, _as_vector(array, dtype))
+
+
+def vectors_to_numpy(messages, homogeneous=False, dtype=np.float64):
+    """Converts an iterable of N Vector3, Point or Point32 messages into an
+    array of shape (N, 3), or (N, 4) if `homogeneous` is set."""
+
+    if homogeneous:
+        data = [(m.x, m.y, m.z, 1.0) for m in messages]
+    else:
+        data = [(m.x, m.y, m.z) for m in messages]
+
+    # Reshaping keeps the number of columns if `messages` is empty
+    return np.array(data, dtype=dtype).reshape(-1, 4 if homogeneous else 3)
 
 
 @converts_to_numpy(
-    Accel,
-    AccelStamped,
-    Twist,
-    TwistStamped,
-    Wrench,
-    WrenchStamped
+    Accel, AccelStamped, Twist, TwistStamped, Wrench, WrenchStamped
 )
 def kinematics_to_numpy(message, homogeneous=False):
 
     message = _unstamp(message)
 
-    is_wrench = isinstance(message, Wrench)
-
-    linear_message = message.force if is_wrench else message.linear
-    angular_message = message.torque if is_wrench else message.angular
+    get_fields = _kinematics_type_to_fields[message.__class__]
+    linear_message, angular_message = get_fields(message)
 
     linear = vector_to_numpy(linear_message, homogeneous=homogeneous)
     angular = vector_to_numpy(angular_message, homogeneous=homogeneous)
@@ -144,38 +205,35 @@ def kinematics_to_numpy(message, homogeneous=False):
 @converts_to_message(Accel, Twist, Wrench)
 def numpy_to_kinamatics(message_type, linear, angular):
 
-    is_wrench = message_type is Wrench
+    linear_key, angular_key = _kinematics_type_to_keys[message_type]
 
-    linear_key = 'force' if is_wrench else 'linear'
-    angular_key = 'torque' if is_wrench else 'angular'
+    linear = _as_vector(linear, np.float64)
+    angular = _as_vector(angular, np.float64)
 
     kwargs = {
-        linear_key: to_message(Vector3, linear),
-        angular_key: to_message(Vector3, angular)
+        linear_key: _vector_to_message(Vector3, linear),
+        angular_key: _vector_to_message(Vector3, angular)
     }
 
     return message_type(**kwargs)
 
 
 @converts_to_numpy(
-    AccelWithCovariance,
-    AccelWithCovarianceStamped,
-    TwistWithCovariance,
-    TwistWithCovarianceStamped,
+    AccelWithCovariance, AccelWithCovarianceStamped,
+    TwistWithCovariance, TwistWithCovarianceStamped,
 )
 def kinematics_with_covariance_to_numpy(message, homogeneous=False):
 
     message = _unstamp(message)
 
-    is_accel = isinstance(message, AccelWithCovariance)
-    kinematics_message = message.accel if is_accel else message.twist
+    get_kinematics = _covariance_type_to_fields[message.__class__]
 
     linear, angular = kinematics_to_numpy(
-        kinematics_message,
+        get_kinematics(message),
         homogeneous=homogeneous
     )
 
-    covariance = np.array(message.covariance, dtype=np.float64).reshape(6, 6)
+    covariance = covariance_to_numpy(message.covariance)
 
     return linear, angular, covariance
 
@@ -187,10 +245,9 @@ def numpy_to_kinematics_with_covariance(
         angular,
         covariance):
 
-    is_accel = message_type is AccelWithCovariance
-
-    kinematics_key = 'accel' if is_accel else 'twist'
-    kinematics_message_type = Accel if is_accel else Twist
+    kinematics_key, kinematics_message_type = (
+        _covariance_type_to_keys[message_type]
+    )
 
     kinematics_message = numpy_to_kinamatics(
         kinematics_message_type,
@@ -208,12 +265,40 @@ def numpy_to_kinematics_with_covariance(
     return message_type(**kwargs)
 
 
+def covariance_to_numpy(covariance):
+
+    try:
+        view = memoryview(covariance)
+
+    except TypeError:
+        view = None
+
+    if view is None:
+        array = np.fromiter(
+            covariance,
+            dtype=np.float64,
+            count=len(covariance)
+        )
+
+    # Avoid boxing each element if the field is a buffer of native doubles
+    # (e.g. an array.array('d')); the copy detaches the result from the message
+    elif view.format == 'd' and view.c_contiguous:
+        array = np.frombuffer(view, dtype=np.float64).copy()
+
+    else:
+        array = np.array(covariance, dtype=np.float64)
+
+    return array.reshape(6, 6)
+
+
 def numpy_to_covariance(array):
 
-    array = cast_to_dtype(array, np.float64)
+    array = np.asarray(array)
     _assert_has_shape(array, (6, 6))
 
-    return tuple(array.flatten())
+    array = cast_to_dtype(array, np.float64)
+
+    return tuple(array.ravel().tolist())
 
 
 @converts_to_numpy(Inertia, InertiaStamped)
@@ -223,11 +308,15 @@ def inertia_to_numpy(message, homogeneous=False):
 
     mass = message.m
     mass_center = vector_to_numpy(message.com, homogeneous=homogeneous)
-    inertia_tensor = np.array([
-        [message.ixx, message.ixy, message.ixz],
-        [message.ixy, message.iyy, message.iyz],
-        [message.ixz, message.iyz, message.izz],
-    ])
+
+    inertia_tensor = np.empty((3, 3), dtype=np.float64)
+
+    inertia_tensor[0, 0] = message.ixx
+    inertia_tensor[1, 1] = message.iyy
+    inertia_tensor[2, 2] = message.izz
+    inertia_tensor[0, 1] = inertia_tensor[1, 0] = message.ixy
+    inertia_tensor[0, 2] = inertia_tensor[2, 0] = message.ixz
+    inertia_tensor[1, 2] = inertia_tensor[2, 1] = message.iyz
 
     return mass, mass_center, inertia_tensor
 
@@ -238,31 +327,40 @@ def numpy_to_inertia(message_type, mass, mass_center, inertia_tensor):
     _assert_has_shape(inertia_tensor, (3, 3))
     inertia_tensor = cast_to_dtype(inertia_tensor, np.float64)
 
-    mass_center_message = numpy_to_vector(Vector3, mass_center)
+    mass_center = _as_vector(mass_center, np.float64)
+    mass_center_message = _vector_to_message(Vector3, mass_center)
 
     return message_type(
         m=float(mass),
         com=mass_center_message,
-        ixx=inertia_tensor[0, 0],
-        ixy=inertia_tensor[0, 1],
-        ixz=inertia_tensor[0, 2],
-        iyy=inertia_tensor[1, 1],
-        iyz=inertia_tensor[2, 1],
-        izz=inertia_tensor[2, 2]
+        ixx=float(inertia_tensor[0, 0]),
+        ixy=float(inertia_tensor[0, 1]),
+        ixz=float(inertia_tensor[0, 2]),
+        iyy=float(inertia_tensor[1, 1]),
+        iyz=float(inertia_tensor[1, 2]),
+        izz=float(inertia_tensor[2, 2])
     )
 
 
 @converts_to_numpy(Polygon, PolygonStamped)
 def polygon_to_numpy(message, homogeneous=False):
+    """Returns the vertices as the columns of a C-contiguous float32 array
+    of shape (3, N), or (4, N) if `homogeneous` is set."""
 
     message = _unstamp(message)
 
-    points = np.array(
-        [vector_to_numpy(p, homogeneous=homogeneous) for p in message.points],
-        dtype=np.float32
-    )
+    points = message.points
+    array = np.empty((4 if homogeneous else 3, len(points)), dtype=np.float32)
 
-    return points.T
+    # Fill whole rows at once, matching the memory layout of the result
+    array[0] = [point.x for point in points]
+    array[1] = [point.y for point in points]
+    array[2] = [point.z for point in points]
+
+    if homogeneous:
+        array[3] = 1.0
+
+    return array
 
 
 @converts_to_message(Polygon)
@@ -275,79 +373,122 @@ def numpy_to_polygon(message_type, points):
              f'{points.shape}.')
         )
 
-    points_msg = []
+    points = cast_to_dtype(points, np.float32)
+
+    if len(points) == 4 and not np.allclose(points[3], 1.0):
+        raise ValueError(
+            (f'Input matrix has four rows, but last row is {points[3]} != 1.')
+        )
 
-    for point in np.hsplit(points, points.shape[1]):
-        point_msg = numpy_to_vector(Point32, point.squeeze())
-        points_msg.append(point_msg)
+    points_msg = [
+        Point32(float(x), float(y), float(z))
+        for x, y, z in zip(points[0], points[1], points[2])
+    ]
 
     return message_type(points_msg)
 
 
 @converts_to_numpy(Quaternion, QuaternionStamped)
-def quaternion_to_numpy(message):
+def quaternion_to_numpy(message, *, _quaternion=quaternion.quaternion):
 
     # TODO add to documentation
     # NOTE: In ROS, the 'w' component of a unit quaternion comes last whereas
     # in np.quaternion, 'w' comes first
 
     message = _unstamp(message)
-    return np.quaternion(message.w, message.x, message.y, message.z)
+
+    x, y, z, w = _get_xyzw(message)
+    return _quaternion(w, x, y, z)
 
 
 @converts_to_message(Quaternion)
-def numpy_to_quaternion(message_type, numpy_obj):
+def numpy_to_quaternion(
+        message_type,
+        numpy_obj,
+        *,
+        _quaternion=quaternion.quaternion,
+        _as_float_array=quaternion.as_float_array):
 
     # TODO add to documentation
     # NOTE: We assume inputs to follow the np.quaternion convention (i.e.
     # 'w' comes first)
 
-    if isinstance(numpy_obj, quaternion.quaternion):
-        numpy_obj = quaternion.as_float_array(numpy_obj)
+    if isinstance(numpy_obj, _quaternion):
+        numpy_obj = _as_float_array(numpy_obj)
 
     else:
         numpy_obj = cast_to_dtype(numpy_obj, np.float64)
         _assert_has_shape(numpy_obj, (4,))
 
     return message_type(
-        x=numpy_obj[1],
-        y=numpy_obj[2],
-        z=numpy_obj[3],
-        w=numpy_obj[0],
+        x=float(numpy_obj[1]),
+        y=float(numpy_obj[2]),
+        z=float(numpy_obj[3]),
+        w=float(numpy_obj[0]),
     )
 
 
+def _frame_to_matrix(position, rotation, out=None):
+    """Assembles a homogeneous transform from a position and rotation
+    message. If given, `out` must be a 4x4 array whose last row is already
+    set to (0, 0, 0, 1)."""
+
+    x, y, z, w = _get_xyzw(rotation)
+
+    # Like quaternion.as_rotation_matrix, this normalizes the quaternion
+    s = 2.0 / (x * x + y * y + z * z + w * w)
+
+    xx, yy, zz = s * x * x, s * y * y, s * z * z
+    xy, xz, yz = s * x * y, s * x * z, s * y * z
+    xw, yw, zw = s * x * w, s * y * w, s * z * w
+
+    matrix = np.eye(4, dtype=np.float64) if out is None else out
+
+    matrix[0, 0] = 1.0 - yy - zz
+    matrix[0, 1] = xy - zw
+    matrix[0, 2] = xz + yw
+    matrix[1, 0] = xy + zw
+    matrix[1, 1] = 1.0 - xx - zz
+    matrix[1, 2] = yz - xw
+    matrix[2, 0] = xz - yw
+    matrix[2, 1] = yz + xw
+    matrix[2, 2] = 1.0 - xx - yy
+
+    px, py, pz = _get_xyz(position)
+
+    matrix[0, 3] = px
+    matrix[1, 3] = py
+    matrix[2, 3] = pz
+
+    return matrix
+
+
 @converts_to_numpy(Pose, PoseStamped, Transform, TransformStamped)
 def frame_to_numpy(message, homogeneous=False):
 
     message = _unstamp(message)
 
-    is_pose = isinstance(message, Pose)
-
-    position_message = message.position if is_pose else message.translation
-    rotation_message = message.orientation if is_pose else message.rotation
-
-    position = vector_to_numpy(position_message, homogeneous=homogeneous)
-    rotation = quaternion_to_numpy(rotation_message)
+    get_fields = _frame_type_to_fields[message.__class__]
+    position_message, rotation_message = get_fields(message)
 
     if homogeneous:
-        as_matrix = np.eye(4, dtype=np.float64)
-
-        as_matrix[:, 3] = position
-        as_matrix[:3, :3] = quaternion.as_rotation_matrix(rotation)
+        return _frame_to_matrix(position_message, rotation_message)
 
-        return as_matrix
+    position = vector_to_numpy(position_message)
+    rotation = quaternion_to_numpy(rotation_message)
 
     return position, rotation
 
 
 @converts_to_message(Pose, Transform)
-def numpy_to_frame(message_type, *args):
-
-    is_pose = message_type is Pose
+def numpy_to_frame(
+        message_type,
+        *args,
+        _from_rotation_matrix=quaternion.from_rotation_matrix):
 
-    position_key = 'position' if is_pose else 'translation'
-    rotation_key = 'orientation' if is_pose else 'rotation'
+    position_key, rotation_key, position_type = (
+        _frame_type_to_keys[message_type]
+    )
 
     if len(args) == 1:
 
@@ -358,7 +499,7 @@ def numpy_to_frame(message_type, *args):
             raise ValueError(f'{matrix} is not a homogeneous matrix.')
 
         position = matrix[:3, 3]
-        rotation = quaternion.from_rotation_matrix(matrix[:3, :3])
+        rotation = _from_rotation_matrix(matrix[:3, :3])
 
     elif len(args) == 2:
         position, rotation = args
@@ -370,8 +511,10 @@ def numpy_to_frame(message_type, *args):
              f'(4x4 np.ndarray), received {args}.')
         )
 
+    position = _as_vector(position, np.float64)
+
     kwargs = {
-        position_key: numpy_to_vector(Vector3, position),
+        position_key: _vector_to_message(position_type, position),
         rotation_key: numpy_to_quaternion(Quaternion, rotation)
     }
 
@@ -384,7 +527,7 @@ def frame_with_covariance_to_numpy(message, homogeneous=False):
     message = _unstamp(message)
 
     pose = frame_to_numpy(message.pose, homogeneous=homogeneous)
-    covariance = np.array(message.covariance, dtype=np.float64).reshape(6, 6)
+    covariance = covariance_to_numpy(message.covariance)
 
     return pose, covariance
 
@@ -394,10 +537,10 @@ def numpy_to_frame_with_covariance(message_type, pose, covariance):
 
     covariance_message = numpy_to_covariance(covariance)
 
-    pose_message = numpy_to_frame(
-        message_type,
-        *pose if isinstance(pose, collections.Sequence) else pose
-    )
+    # `pose` is either a homogeneous matrix or a (position, rotation) pair
+    pose_args = (pose,) if isinstance(pose, np.ndarray) else tuple(pose)
+
+    pose_message = numpy_to_frame(Pose, *pose_args)
 
     return message_type(pose=pose_message, covariance=covariance_message)
 
@@ -405,6 +548,17 @@ def numpy_to_frame_with_covariance(message_type, pose, covariance):
 @converts_to_numpy(PoseArray)
 def pose_array_to_numpy(message, homogeneous=False, as_array=False):
 
+    if homogeneous and as_array:
+        result = np.zeros((len(message.poses), 4, 4), dtype=np.float64)
+        result[:, 3, 3] = 1.0
+
+        get_fields = _frame_type_to_fields[Pose]
+
+        for pose, matrix in zip(message.poses, result):
+            _frame_to_matrix(*get_fields(pose), out=matrix)
+
+        return result
+
     result = [
         frame_to_numpy(pose, homogeneous=homogeneous) for pose in message.poses
     ]
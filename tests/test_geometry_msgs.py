@@ -1,5 +1,6 @@
 # coding: utf-8
 
+import array
 import warnings
 
 import pytest
@@ -11,6 +12,7 @@ with warnings.catch_warnings():
     import quaternion
 
 from numpy_ros import to_numpy, to_message
+from numpy_ros.geometry_msgs import vectors_to_numpy
 
 
 @pytest.fixture
@@ -229,6 +231,27 @@ def test_accel_with_covariance_stamped_to_numpy(
     )
 
 
+def test_accel_with_covariance_buffer_to_numpy(accel_msg, covariance):
+    message = AccelWithCovariance(accel_msg, array.array('d', range(36)))
+    _, _, covariance_ = to_numpy(message)
+
+    assert array_equal(covariance_, covariance)
+
+
+def test_accel_with_covariance_int_array_to_numpy(accel_msg, covariance):
+    message = AccelWithCovariance(accel_msg, np.arange(36, dtype=np.int64))
+    _, _, covariance_ = to_numpy(message)
+
+    assert array_equal(covariance_, covariance)
+
+
+def test_accel_with_covariance_bytes_to_numpy(accel_msg):
+    message = AccelWithCovariance(accel_msg, bytes(36 * 8))
+
+    with pytest.raises(ValueError):
+        to_numpy(message)
+
+
 def test_numpy_to_accel_with_covariance(vector, accel_msg, covariance):
     message = to_message(AccelWithCovariance, vector, vector, covariance)
 
@@ -294,6 +317,18 @@ def test_inertia_to_numpy_hom(inertia_msg, vector_hom, inertia_tensor):
     assert array_equal(inertia_tensor_, inertia_tensor)
 
 
+def test_numpy_to_inertia(inertia_msg, vector, inertia_tensor):
+
+    # Off-diagonal entries are read from the upper triangle
+    inertia_tensor[2, 1] = 7.0
+    message = to_message(Inertia, 0.0, vector, inertia_tensor)
+
+    assert isinstance(message, Inertia)
+    assert message == inertia_msg
+    assert message.iyz == inertia_tensor[1, 2]
+    assert type(message.ixx) is float and type(message.iyz) is float
+
+
 # Quaternion
 
 
@@ -343,6 +378,24 @@ def test_numpy_to_vector_invalid_dtype():
         to_message(Point32, array)
 
 
+def test_vectors_to_numpy(vector3_msg, point_msg, vector):
+    as_array = vectors_to_numpy([vector3_msg, point_msg])
+
+    assert array_equal(as_array, np.stack([vector, vector]))
+
+
+def test_vectors_to_numpy_hom(point32_msg, vector_hom):
+    as_array = vectors_to_numpy(
+        (point32_msg for _ in range(3)),
+        homogeneous=True,
+        dtype=np.float32
+    )
+
+    assert as_array.shape == (3, 4)
+    assert as_array.dtype == np.float32
+    assert np.all(as_array == vector_hom)
+
+
 def test_vector3_to_numpy(vector3_msg, vector):
     as_array = to_numpy(vector3_msg)
 
@@ -397,3 +450,137 @@ def test_point32_to_numpy_hom(point32_msg, vector_hom):
 
     assert np.all(as_array == vector_hom)
     assert as_array.dtype == np.float32
+
+
+# PoseWithCovariance, PoseWithCovarianceStamped
+
+
+def test_pose_with_covariance_stamped_to_numpy(covariance):
+    pose = Pose(Point(1.0, 2.0, 3.0), Quaternion(0.0, 0.0, 0.0, 1.0))
+    message = PoseWithCovarianceStamped(
+        pose=PoseWithCovariance(pose, tuple(float(x) for x in range(36)))
+    )
+
+    (position, rotation), covariance_ = to_numpy(message)
+
+    assert array_equal(position, np.array([1.0, 2.0, 3.0]))
+    assert rotation == np.quaternion(1.0, 0.0, 0.0, 0.0)
+    assert array_equal(covariance_, covariance)
+
+
+def test_numpy_to_pose_with_covariance(vector, covariance):
+    rotation = np.quaternion(1.0, 0.0, 0.0, 0.0)
+
+    message = to_message(
+        PoseWithCovariance,
+        (vector, rotation),
+        covariance
+    )
+
+    assert isinstance(message, PoseWithCovariance)
+
+    assert isinstance(message.pose, Pose)
+    assert message.pose == Pose(
+        Point(1.0, 2.0, 3.0),
+        Quaternion(0.0, 0.0, 0.0, 1.0)
+    )
+
+    assert array_equal(np.array(message.covariance).reshape(6, 6), covariance)
+
+
+# Pose
+
+
+def test_pose_to_numpy_hom():
+    # Rotation by 90 degrees about the z-axis
+    message = Pose(
+        Point(1.0, 2.0, 3.0),
+        Quaternion(0.0, 0.0, np.sqrt(0.5), np.sqrt(0.5))
+    )
+
+    as_matrix = to_numpy(message, homogeneous=True)
+
+    expected = np.array([
+        [0.0, -1.0, 0.0, 1.0],
+        [1.0, 0.0, 0.0, 2.0],
+        [0.0, 0.0, 1.0, 3.0],
+        [0.0, 0.0, 0.0, 1.0],
+    ])
+
+    assert as_matrix.dtype == np.float64
+    assert np.allclose(as_matrix, expected)
+
+
+def test_numpy_to_pose_and_transform(vector):
+    rotation = np.quaternion(1.0, 0.0, 0.0, 0.0)
+
+    pose = to_message(Pose, vector, rotation)
+    transform = to_message(Transform, vector, rotation)
+
+    assert pose.position == Point(1.0, 2.0, 3.0)
+    assert type(pose.orientation.x) is float
+    assert type(pose.orientation.w) is float
+    assert transform.translation == Vector3(1.0, 2.0, 3.0)
+
+
+# PoseArray
+
+
+def test_pose_array_to_numpy_hom_as_array():
+    poses = [
+        Pose(Point(float(i), 0.0, 0.0), Quaternion(0.0, 0.0, 0.0, 1.0))
+        for i in range(3)
+    ]
+
+    as_array = to_numpy(
+        PoseArray(poses=poses),
+        homogeneous=True,
+        as_array=True
+    )
+
+    assert as_array.shape == (3, 4, 4)
+    assert as_array.dtype == np.float64
+
+    for i, matrix in enumerate(as_array):
+        expected = np.eye(4)
+        expected[0, 3] = i
+
+        assert np.allclose(matrix, expected)
+
+
+# Polygon, PolygonStamped
+
+
+def test_polygon_to_numpy():
+    points = [Point32(float(i), 2.0 * i, 3.0 * i) for i in range(4)]
+    as_array = to_numpy(PolygonStamped(polygon=Polygon(points)))
+
+    expected = np.array([
+        [0.0, 1.0, 2.0, 3.0],
+        [0.0, 2.0, 4.0, 6.0],
+        [0.0, 3.0, 6.0, 9.0],
+    ], dtype=np.float32)
+
+    assert array_equal(as_array, expected)
+    assert as_array.flags.c_contiguous
+
+
+def test_polygon_to_numpy_hom():
+    points = [Point32(1.0, 2.0, 3.0)] * 2
+    as_array = to_numpy(Polygon(points), homogeneous=True)
+
+    assert as_array.shape == (4, 2)
+    assert np.all(as_array[3] == 1.0)
+
+
+def test_numpy_to_polygon():
+    points = np.array([
+        [0.0, 1.0],
+        [0.0, 2.0],
+        [0.0, 3.0],
+    ], dtype=np.float32)
+
+    message = to_message(Polygon, points)
+
+    assert message == Polygon([Point32(0.0, 0.0, 0.0), Point32(1.0, 2.0, 3.0)])
+